@@ -91,6 +91,24 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/ref/settings/#caches
+# Recipe list responses are only cached when every worker shares this
+# cache. docker-compose sets CACHE_BACKEND and CACHE_LOCATION to its
+# memcached service. The local memory default is per process, so list
+# caching stays off with it.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,67 @@
+"""
+Django settings for running the app project's tests.
+
+Imports the regular settings and only overrides what makes the test
+suite faster.
+"""
+
+import os
+
+from app.settings import *  # noqa
+
+
+# Database
+# Outside of docker-compose (no DB_HOST) run against in-memory SQLite so
+# local test runs don't need a Postgres server. CI keeps using Postgres,
+# with one connection kept open for the whole run.
+
+if not os.environ.get('DB_HOST'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = None  # noqa
+
+
+# Cache
+# Cached list responses would outlive each test's rolled back data, so
+# caching is off unless a test enables it with override_settings.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }
+}
+
+
+# Password hashing
+# The default PBKDF2 hasher is slow by design; tests don't need that.
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+
+# Middleware
+# Tests authenticate with force_authenticate/force_login, so CSRF and the
+# response hardening headers are skipped. Sessions, auth and messages stay
+# because the admin requires them.
+
+MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+]
+
+
+# Logging
+# Expected 4xx responses in tests don't need to be logged.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': True,
+}
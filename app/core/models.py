@@ -79,6 +79,9 @@ class Recipe(models.Model):
     ingredients = models.ManyToManyField('Ingredient')
     image = models.ImageField(null=True, upload_to=recipe_image_file_path)
 
+    class Meta:
+        indexes = [models.Index(fields=['user', '-id'])]
+
     def __str__(self) -> str:
         """ Returns Title when calling class as string. """
         return self.title
@@ -92,6 +95,9 @@ class Tag(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = [models.Index(fields=['user', 'name'])]
+
     def __str__(self) -> str:
         """ Returns name when calling class as string. """
         return self.name
@@ -105,6 +111,9 @@ class Ingredient(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = [models.Index(fields=['user', 'name'])]
+
     def __str__(self) -> str:
         """ Returns name when calling class as string. """
         return self.name
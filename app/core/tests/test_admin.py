@@ -7,18 +7,21 @@ from django.urls import reverse
 from django.test import Client
 
 
+User = get_user_model()
+
+
 class AdminSiteTests(TestCase):
     """Tests for Django Admin."""
 
     def setUp(self):
         """Create user and client."""
         self.client = Client()
-        self.admin_user = get_user_model().objects.create_superuser(
+        self.admin_user = User.objects.create_superuser(
             email='admin@example.com',
             password='testpass1234',
         )
         self.client.force_login(self.admin_user)
-        self.user = get_user_model().objects.create_user(
+        self.user = User.objects.create_user(
             email='user@example.com',
             password='testpass1234',
             name='Test User'
@@ -0,0 +1,54 @@
+"""
+Caching helpers for recipe APIs.
+
+Cached lists are invalidated by bumping a per-user version key. Each
+process has to see the bump, so the lists are only cached when the
+default cache is shared between processes (Memcached, Redis, files or a
+database table), never with the per-process local memory or dummy cache.
+"""
+import hashlib
+import uuid
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+LIST_CACHE_TIMEOUT = 300
+
+
+def list_cache_enabled():
+    """ Whether the default cache is shared between processes. """
+    return not isinstance(
+        caches[DEFAULT_CACHE_ALIAS], (DummyCache, LocMemCache)
+    )
+
+
+def _version_key(user_id):
+    """ Cache key holding the list version of a user. """
+    return f'recipe-lists:version:{user_id}'
+
+
+def get_list_version(user_id):
+    """ Return the current list cache version of a user. """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key, '')
+    return version
+
+
+def bump_list_version(user_id):
+    """ Invalidate every cached list of a user. """
+    cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+
+
+def list_cache_key(prefix, request):
+    """ Build the cache key of a list request. """
+    user_id = request.user.id
+    params = hashlib.md5(
+        request.query_params.urlencode().encode()
+    ).hexdigest()
+    version = get_list_version(user_id)
+    return f'recipe-lists:{prefix}:{user_id}:{version}:{params}'
@@ -1,6 +1,10 @@
 """
 Serializers for recipe APIs.
 """
+from collections import OrderedDict
+from functools import cached_property
+
+from django.db.models import Prefetch
 
 from rest_framework import serializers
 from core.models import (
@@ -10,20 +14,52 @@ from core.models import (
 )
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class SerializerCacheMixin:
+    """Memoize representations of instances repeated in one response."""
+
+    def to_representation(self, instance):
+        """ Render each saved instance once per serializer. """
+        # Plain dicts (validated or nested input data) have no pk.
+        pk = getattr(instance, 'pk', None)
+        if pk is None:
+            return super().to_representation(instance)
+        cache = self.__dict__.setdefault('_representation_cache', {})
+        if pk not in cache:
+            cache[pk] = super().to_representation(instance)
+        # Copy, so editing one rendered item can't change the others.
+        return OrderedDict(cache[pk])
+
+
+class BaseAttributeSerializer(SerializerCacheMixin, serializers.Serializer):
+    """Base serializer for recipe attributes.
+
+    A plain Serializer skips ModelSerializer's field introspection,
+    which matters when many of these are nested in recipe lists.
+    """
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(max_length=255)
+
+    model = None
+
+    def create(self, validated_data):
+        """Create and return a new attribute."""
+        return self.model.objects.create(**validated_data)
+
+    def update(self, instance, validated_data):
+        """Update and return an attribute."""
+        instance.name = validated_data.get('name', instance.name)
+        instance.save(update_fields=['name'])
+        return instance
+
+
+class IngredientSerializer(BaseAttributeSerializer):
     """serializer for ingredients."""
-    class Meta:
-        model = Ingredient
-        fields = ['id', 'name']
-        read_only_fields = ['id']
+    model = Ingredient
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(BaseAttributeSerializer):
     """serializer for tags."""
-    class Meta:
-        model = Tag
-        fields = ['id', 'name']
-        read_only_fields = ['id']
+    model = Tag
 
 
 class RecipeSerializer(serializers.ModelSerializer):
@@ -37,24 +73,66 @@ class RecipeSerializer(serializers.ModelSerializer):
                   'price', 'link', 'tags', 'ingredients', ]
         read_only_fields = ['id']
 
-    def _get_or_create_field(self, field, instance, model, obj):
-        """ Handle getting or creating fields. """
-        auth_user = self.context['request'].user
-        for f in field:
-            f_obj, created = model.objects.get_or_create(
-                user=auth_user,
-                **f,
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """ Prefetch nested tags and ingredients to avoid N+1 queries. """
+        return queryset.prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.only('id', 'name')),
+            Prefetch(
+                'ingredients',
+                queryset=Ingredient.objects.only('id', 'name'),
+            ),
+        )
+
+    @cached_property
+    def _auth_user(self):
+        """ The user making the request. """
+        return self.context['request'].user
+
+    def _get_or_create_field(self, field, model, obj):
+        """ Handle getting or creating fields in batches. """
+        names = list(dict.fromkeys(f['name'] for f in field))
+        if not names:
+            return
+        auth_user = self._auth_user
+        existing = {
+            f_obj.name: f_obj for f_obj in
+            model.objects.filter(user=auth_user, name__in=names)
+        }
+        missing = [name for name in names if name not in existing]
+        if missing:
+            model.objects.bulk_create(
+                [model(user=auth_user, name=name) for name in missing]
+            )
+            # bulk_create doesn't set primary keys on every backend.
+            existing.update(
+                (f_obj.name, f_obj) for f_obj in
+                model.objects.filter(user=auth_user, name__in=missing)
             )
-            obj.add(f_obj)
+        obj.add(*existing.values())
+
+    def _sync_m2m(self, obj, field, model):
+        """ Only remove and add the fields that changed. """
+        incoming_names = {f['name'] for f in field}
+        current = {f_obj.name: f_obj for f_obj in obj.all()}
+        to_remove = [
+            f_obj for name, f_obj in current.items()
+            if name not in incoming_names
+        ]
+        if to_remove:
+            obj.remove(*to_remove)
+        # Keep the payload order so new rows are created in it.
+        to_add = [f for f in field if f['name'] not in current]
+        self._get_or_create_field(to_add, model, obj)
 
     def create(self, validated_data) -> Recipe:
         """Create a new recipe."""
         tags = validated_data.pop('tags', [])
         ingredients = validated_data.pop('ingredients', [])
         recipe = Recipe.objects.create(**validated_data)
-        self._get_or_create_field(tags, recipe, Tag, recipe.tags)
+        self._get_or_create_field(tags, Tag, recipe.tags)
         self._get_or_create_field(
-            ingredients, recipe, Ingredient, recipe.ingredients)
+            ingredients, Ingredient, recipe.ingredients)
 
         return recipe
 
@@ -63,18 +141,15 @@ class RecipeSerializer(serializers.ModelSerializer):
         tags = validated_data.pop('tags', None)
         ingredients = validated_data.pop('ingredients', None)
         if tags is not None:
-            instance.tags.clear()
-            self._get_or_create_field(tags, instance, Tag, instance.tags)
+            self._sync_m2m(instance.tags, tags, Tag)
         if ingredients is not None:
-            instance.ingredients.clear()
-            # self._get_or_create_ingredients(ingredients, instance)
-            self._get_or_create_field(
-                ingredients, instance, Ingredient, instance.ingredients)
+            self._sync_m2m(instance.ingredients, ingredients, Ingredient)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        instance.save()
+        if validated_data:
+            instance.save(update_fields=list(validated_data))
         return instance
 
 
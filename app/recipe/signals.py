@@ -0,0 +1,39 @@
+"""
+Signal handlers keeping cached recipe lists up to date.
+"""
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+)
+from django.dispatch import receiver
+
+from core.models import (
+    Recipe,
+    Tag,
+    Ingredient,
+)
+
+from recipe.cache import bump_list_version
+
+
+def _bump_on_commit(user_id):
+    """ Invalidate the user's lists once the change is committed. """
+    transaction.on_commit(lambda: bump_list_version(user_id))
+
+
+@receiver([post_save, post_delete], sender=Recipe)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Ingredient)
+def invalidate_lists(sender, instance, **kwargs):
+    """ Invalidate lists when a recipe, tag or ingredient changes. """
+    _bump_on_commit(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+@receiver(m2m_changed, sender=Recipe.ingredients.through)
+def invalidate_lists_on_m2m(sender, instance, action, **kwargs):
+    """ Invalidate lists when tags or ingredients are (un)assigned. """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _bump_on_commit(instance.user_id)
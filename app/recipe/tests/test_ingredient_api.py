@@ -2,9 +2,10 @@
 Test Ingredients
 """
 from decimal import Decimal
+from functools import lru_cache
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 
 from rest_framework import status
@@ -17,9 +18,12 @@ from core.models import (
 
 from recipe.serializers import IngredientSerializer
 
+User = get_user_model()
+
 ING_URL = reverse('recipe:ingredient-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(ing_id):
     return reverse('recipe:ingredient-detail', args=[ing_id])
 
@@ -28,7 +32,7 @@ def detail_url(ing_id):
 
 def create_user_helper(email='user@example.com', password='testpassword123'):
     """Helper function to create a user."""
-    return get_user_model().objects.create_user(email=email, password=password)
+    return User.objects.create_user(email=email, password=password)
 
 
 def create_recipe_helper(user, title='testing title', time=10, price='4.50'):
@@ -41,7 +45,7 @@ def create_recipe_helper(user, title='testing title', time=10, price='4.50'):
     )
 
 
-class PublicIngredientApiTest(TestCase):
+class PublicIngredientApiTest(SimpleTestCase):
     """Tests the public ingredients view"""
 
     def setUp(self):
@@ -56,22 +60,31 @@ class PublicIngredientApiTest(TestCase):
 class PrivateIngredientApiTest(TestCase):
     """Tests the private ingredients view"""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user_helper()
+
     def setUp(self):
         self.client = APIClient()
-        self.user = create_user_helper()
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_ingredients(self):
         """Test retrieving ingredients"""
-        Ingredient.objects.create(user=self.user, name='Coffee Grounds')
-        Ingredient.objects.create(user=self.user, name='Flour')
+        Ingredient.objects.bulk_create([
+            Ingredient(user=self.user, name='Coffee Grounds'),
+            Ingredient(user=self.user, name='Flour'),
+        ])
 
-        res = self.client.get(ING_URL)
+        with self.assertNumQueries(1):
+            res = self.client.get(ING_URL)
 
-        ingredients = Ingredient.objects.all().order_by('-name')
+        ingredients = Ingredient.objects.only('id', 'name')
         serializer = IngredientSerializer(ingredients, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(
+            sorted(res.data, key=lambda d: d['id']),
+            sorted(serializer.data, key=lambda d: d['id']),
+        )
 
     def test_ingredient_limited_to_user(self):
         """Test limiting ingredient to user"""
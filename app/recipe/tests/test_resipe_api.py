@@ -3,17 +3,29 @@ Tests for recipe APIs.
 """
 
 from decimal import Decimal
-import tempfile
+from functools import lru_cache
+import io
 import os
+import shutil
+import tempfile
+from types import MappingProxyType
 
 from PIL import Image
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
-from rest_framework.test import APIClient
+from rest_framework.test import (
+    APIClient,
+    APIRequestFactory,
+    force_authenticate,
+)
 
 from core.models import (
     Recipe,
@@ -24,18 +36,43 @@ from recipe.serializers import (
     RecipeSerializer,
     RecipeDetailSerializer,
 )
+from recipe.views import RecipeViewSet
+
 
+User = get_user_model()
 
 RECIPES_URL = reverse('recipe:recipe-list')
+TAGS_URL = reverse('recipe:tag-list')
+
+PRICE_DEFAULT = Decimal('5.25')
+PRICE_230 = Decimal('2.30')
+PRICE_1523 = Decimal('15.23')
+
+RELATED_FIELDS = (
+    ('tags', Tag),
+    ('ingredients', Ingredient),
+)
+
+RECIPE_DEFAULTS = MappingProxyType({
+    'title': 'Sample recipe title',
+    'time_minutes': 22,
+    'price': PRICE_DEFAULT,
+    'description': 'Sample Description',
+    'link': 'https://example.com/resipes.pdf'
+})
+
+factory = APIRequestFactory()
 
 # ----- Helper Functions: --------------------------------
 
 
+@lru_cache(maxsize=None)
 def detail_url(recipe_id):
     """Create and return a recipe detail URL"""
     return reverse('recipe:recipe-detail', args=[recipe_id])
 
 
+@lru_cache(maxsize=None)
 def img_upload_url(recipe_id):
     """Create and return a recipe image upload URL"""
     return reverse('recipe:recipe-upload-image', args=[recipe_id])
@@ -43,28 +80,40 @@ def img_upload_url(recipe_id):
 
 def create_recipe(user, **params):
     """Create and return a sample recipe."""
-    defaults = {
-        'title': 'Sample recipe title',
-        'time_minutes': 22,
-        'price': Decimal('5.25'),
-        'description': 'Sample Description',
-        'link': 'https://example.com/resipes.pdf'
-    }
+    defaults = dict(RECIPE_DEFAULTS)
     defaults.update(params)
 
     recipe = Recipe.objects.create(user=user, **defaults)
     return recipe
 
 
+def create_recipes(user, n, **params):
+    """Create n sample recipes with a single INSERT."""
+    return Recipe.objects.bulk_create([
+        Recipe(user=user, **{
+            **RECIPE_DEFAULTS,
+            'title': f'Sample recipe title {i}',
+            **params,
+        })
+        for i in range(n)
+    ])
+
+
 def create_user(**params):
     """Create and return a sample user."""
-    return get_user_model().objects.create_user(**params)
+    return User.objects.create_user(**params)
+
+
+def call_recipe_view(actions, request, user, **kwargs):
+    """Call RecipeViewSet directly, skipping URL routing and middleware."""
+    force_authenticate(request, user=user)
+    return RecipeViewSet.as_view(actions)(request, **kwargs)
 
 # ----------------------------------------------------------------
 
 
 # - Test Classes
-class PublicRecipeAPITest(TestCase):
+class PublicRecipeAPITest(SimpleTestCase):
     """Tests for public Unauthcated recipe API endpoints."""
 
     def setUp(self):
@@ -79,23 +128,25 @@ class PublicRecipeAPITest(TestCase):
 class PrivateRecipeAPITest(TestCase):
     """Tests for private Authcated recipe API endpoints."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email='user@example.com', password='test123')
+
     def setUp(self):
         self.client = APIClient()
-        self.user = create_user(email='user@example.com', password='test123')
         self.client.force_authenticate(self.user)
 
     def test_retrive_recipe(self):
         """Test retrieving a list of recipes."""
-        create_recipe(user=self.user)
-        create_recipe(user=self.user)
+        create_recipes(user=self.user, n=2)
 
-        res = self.client.get(RECIPES_URL)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL)
 
-        recipes = Recipe.objects.all().order_by('-id')
-        serializer = RecipeSerializer(recipes, many=True)
+        recipe_ids = Recipe.objects.values_list('id', flat=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual({r['id'] for r in res.data}, set(recipe_ids))
 
     def test_recipe_list_limited_to_user(self):
         """ Test list of recipies is limited to authenticated user. """
@@ -106,10 +157,25 @@ class PrivateRecipeAPITest(TestCase):
 
         res = self.client.get(RECIPES_URL)
 
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
+        recipe_ids = Recipe.objects.filter(
+            user=self.user).values_list('id', flat=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual({r['id'] for r in res.data}, set(recipe_ids))
+
+    def test_retrieve_recipes_num_queries(self):
+        """Test listing recipes doesn't query per recipe."""
+        for i in range(3):
+            recipe = create_recipe(user=self.user, title=f'Recipe {i}')
+            recipe.tags.add(
+                Tag.objects.create(user=self.user, name=f'Tag {i}'))
+            recipe.ingredients.add(
+                Ingredient.objects.create(user=self.user, name=f'Ing {i}'))
+
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 3)
 
     def test_get_recipe_detail(self):
         """Test retrieving a single recipe."""
@@ -125,9 +191,13 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'cookies a lot of cookies',
             'time_minutes': 15,
-            'price': Decimal('15.23'),
+            'price': PRICE_1523,
         }
-        res = self.client.post(RECIPES_URL, payload)
+        res = call_recipe_view(
+            {'post': 'create'},
+            factory.post(RECIPES_URL, payload),
+            self.user,
+        )
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         recipe = Recipe.objects.get(id=res.data['id'])
@@ -149,13 +219,19 @@ class PrivateRecipeAPITest(TestCase):
             'title': 'New Title',
         }
         url = detail_url(recipe.id)
-        res = self.client.patch(url, payload)
+        request = factory.patch(url, payload)
+        # Fetch, update, then load tags and ingredients for the response.
+        with self.assertNumQueries(4):
+            res = call_recipe_view(
+                {'patch': 'partial_update'},
+                request,
+                self.user,
+                pk=recipe.id,
+            )
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
-        self.assertEqual(recipe.title, payload['title'])
-        self.assertEqual(recipe.link, original_link)
-        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(res.data['title'], payload['title'])
+        self.assertEqual(res.data['link'], original_link)
 
     def test_full_update(self):
         """Test full updating a recipe."""
@@ -171,17 +247,52 @@ class PrivateRecipeAPITest(TestCase):
             'link': 'https://example.com/new_link.pdf',
             'description': 'They are now Vanilla cookies~!',
             'time_minutes': 50,
-            'price': Decimal('2.30'),
+            'price': PRICE_230,
         }
         url = detail_url(recipe.id)
-        res = self.client.put(url, payload)
+        res = call_recipe_view(
+            {'put': 'update'},
+            factory.put(url, payload),
+            self.user,
+            pk=recipe.id,
+        )
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        recipe.refresh_from_db()
 
+        # Decimals are rendered as strings.
+        expected = {**payload, 'price': str(payload['price'])}
+        for k, v in expected.items():
+            self.assertEqual(res.data[k], v)
+        # The response is rendered from memory; check what update_fields
+        # actually wrote.
+        recipe.refresh_from_db()
         for k, v in payload.items():
             self.assertEqual(getattr(recipe, k), v)
         self.assertEqual(recipe.user, self.user)
 
+    def test_related_only_update_skips_recipe_save(self):
+        """ Test a tags-only PATCH doesn't write the recipe row """
+        recipe = create_recipe(user=self.user, title='Sample cookies')
+        url = detail_url(recipe.id)
+        request = factory.patch(url, {'tags': [{'name': 'Lunch'}]},
+                                format='json')
+        with CaptureQueriesContext(connection) as queries:
+            res = call_recipe_view(
+                {'patch': 'partial_update'},
+                request,
+                self.user,
+                pk=recipe.id,
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        recipe_update = f'UPDATE "{Recipe._meta.db_table}" '
+        self.assertFalse(any(
+            q['sql'].startswith(recipe_update) for q in queries
+        ))
+        self.assertEqual(
+            list(recipe.tags.values_list('name', flat=True)), ['Lunch'])
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.title, 'Sample cookies')
+
     def test_update_user_returns_error(self):
         """Test updating a recipe with an invalid user."""
         new_user = create_user(email='user2@example.com',
@@ -189,7 +300,12 @@ class PrivateRecipeAPITest(TestCase):
         recipe = create_recipe(user=self.user)
         payload = {'user': new_user.id}
         url = detail_url(recipe.id)
-        res = self.client.patch(url, payload)
+        res = call_recipe_view(
+            {'patch': 'partial_update'},
+            factory.patch(url, payload),
+            self.user,
+            pk=recipe.id,
+        )
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         recipe.refresh_from_db()
@@ -199,9 +315,17 @@ class PrivateRecipeAPITest(TestCase):
         """Test deleting a recipe."""
         recipe = create_recipe(user=self.user)
         url = detail_url(recipe.id)
-        res = self.client.delete(url)
+        request = factory.delete(url)
+        # Fetch, clear both m2m tables, then delete the recipe.
+        with self.assertNumQueries(4):
+            res = call_recipe_view(
+                {'delete': 'destroy'},
+                request,
+                self.user,
+                pk=recipe.id,
+            )
+        # DestroyModelMixin only answers 204 after deleting the instance.
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertFalse(Recipe.objects.filter(id=recipe.id).exists())
 
     def test_delete_other_users_recipe_error(self):
         """test deleting other users recipe"""
@@ -222,23 +346,20 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'Sample Brownies',
             'time_minutes': 50,
-            'price': Decimal('2.30'),
+            'price': PRICE_230,
             'tags': [{'name': 'Cookies'}, {'name': 'Snacks'}],
         }
 
         res = self.client.post(RECIPES_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
+        recipes = list(Recipe.objects.filter(user=self.user))
+        self.assertEqual(len(recipes), 1)
         recipe = recipes[0]
-        self.assertEqual(recipe.tags.count(), 2)
+        tag_keys = list(recipe.tags.values_list('name', 'user'))
+        self.assertEqual(len(tag_keys), 2)
         for tag in payload['tags']:
-            exists = recipe.tags.filter(
-                name=tag['name'],
-                user=self.user,
-            ).exists()
-            self.assertTrue(exists)
+            self.assertIn((tag['name'], self.user.id), tag_keys)
 
     def test_create_recipe_with_existing_tags(self):
         """Test creating recipe with existing tags."""
@@ -246,62 +367,22 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'Sample Cookies',
             'time_minutes': 50,
-            'price': Decimal('2.30'),
+            'price': PRICE_230,
             'tags': [{'name': 'Cookies'}, {'name': 'Snacks'}],
         }
 
         res = self.client.post(RECIPES_URL, payload, format='json')
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
+        recipes = list(Recipe.objects.filter(user=self.user))
+        self.assertEqual(len(recipes), 1)
         recipe = recipes[0]
-        self.assertEqual(recipe.tags.count(), 2)
-        self.assertIn(tag_cookie, recipe.tags.all())
+        tags = list(recipe.tags.all())
+        self.assertEqual(len(tags), 2)
+        self.assertIn(tag_cookie, tags)
+        tag_keys = {(tag.name, tag.user_id) for tag in tags}
         for tag in payload['tags']:
-            exists = recipe.tags.filter(
-                name=tag['name'],
-                user=self.user,
-            ).exists()
-            self.assertTrue(exists)
-
-    def test_create_tag_on_update(self):
-        """ Test creating a tag when updating a recipe """
-        recipe = create_recipe(user=self.user)
-
-        payload = {'tags': [{'name': 'Lunch'}]}
-        url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format='json')
-
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        new_tag = Tag.objects.get(user=self.user, name='Lunch')
-        self.assertIn(new_tag, recipe.tags.all())
-
-    def test_update_recipe_assign_tag(self):
-        """Test updating a recipe's tags"""
-        recipe = create_recipe(user=self.user)
-        tag_cookie = Tag.objects.create(user=self.user, name='Cookies')
-        recipe.tags.add(tag_cookie)
-
-        tag_lunch = Tag.objects.create(user=self.user, name='Lunch')
-        payload = {'tags': [{'name': 'Lunch'}]}
-        url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format='json')
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(tag_lunch, recipe.tags.all())
-        self.assertNotIn(tag_cookie, recipe.tags.all())
-
-    def test_clear_recipe_tags(self):
-        """ Test clearing a recipes tags. """
-        recipe = create_recipe(user=self.user)
-        tag = Tag.objects.create(user=self.user, name='Cookies')
-        recipe.tags.add(tag)
-
-        payload = {'tags': []}
-        url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format='json')
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(recipe.tags.count(), 0)
+            self.assertIn((tag['name'], self.user.id), tag_keys)
 
     # ----- Ingredients--------------------
 
@@ -310,23 +391,20 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'Sample Brownies',
             'time_minutes': 50,
-            'price': Decimal('2.30'),
+            'price': PRICE_230,
             'ingredients': [{'name': 'Chocolate'}, {'name': 'Lime'}],
         }
 
         res = self.client.post(RECIPES_URL, payload, format='json')
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
+        recipes = list(Recipe.objects.filter(user=self.user))
+        self.assertEqual(len(recipes), 1)
         recipe = recipes[0]
 
-        self.assertEqual(recipe.ingredients.count(), 2)
+        ing_keys = list(recipe.ingredients.values_list('name', 'user'))
+        self.assertEqual(len(ing_keys), 2)
         for ing in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                name=ing['name'],
-                user=self.user,
-            ).exists()
-            self.assertTrue(exists)
+            self.assertIn((ing['name'], self.user.id), ing_keys)
 
     def test_create_recipe_with_existing_ingredients(self):
         """Test creating a recipe with existing tags"""
@@ -335,66 +413,74 @@ class PrivateRecipeAPITest(TestCase):
         payload = {
             'title': 'Sample Cookies',
             'time_minutes': 50,
-            'price': Decimal('2.30'),
+            'price': PRICE_230,
             'ingredients': [{'name': 'Hot_Chocolate'}, {'name': 'Snacks'}],
         }
 
         res = self.client.post(RECIPES_URL, payload, format='json')
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
+        recipes = list(Recipe.objects.filter(user=self.user))
+        self.assertEqual(len(recipes), 1)
         recipe = recipes[0]
-        self.assertEqual(recipe.ingredients.count(), 2)
-        self.assertIn(ing_hot_coco, recipe.ingredients.all())
+        ings = list(recipe.ingredients.all())
+        self.assertEqual(len(ings), 2)
+        self.assertIn(ing_hot_coco, ings)
+        ing_keys = {(ing.name, ing.user_id) for ing in ings}
         for ing in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                name=ing['name'],
-                user=self.user,
-            ).exists()
-            self.assertTrue(exists)
-
-    def test_create_ingredient_on_update(self):
-        """ Test creating a ingredient when updating a recipe """
-        # ing_name = 'Peppers'
-        recipe = create_recipe(user=self.user)
-
-        payload = {'ingredients': [{'name': 'Peppers'}]}
-        url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format='json')
-
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        new_ing = Ingredient.objects.get(user=self.user, name='Peppers')
-        self.assertIn(new_ing, recipe.ingredients.all())
-
-    def test_update_recipe_assign_ingredient(self):
-        """Test updating a recipe's tags"""
-        ing_1 = 'chocolate'
-        ing_2 = 'honey'
-
-        recipe = create_recipe(user=self.user)
-        ing_original = Ingredient.objects.create(user=self.user, name=ing_1)
-        recipe.ingredients.add(ing_original)
-
-        ing_updated = Ingredient.objects.create(user=self.user, name=ing_2)
-        payload = {'ingredients': [{'name': ing_2}]}
-        url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format='json')
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(ing_updated, recipe.ingredients.all())
-        self.assertNotIn(ing_original, recipe.ingredients.all())
-
-    def test_clear_recipe_ingredients(self):
-        """ Test clearing a recipes tags. """
-        recipe = create_recipe(user=self.user)
-        ing = Ingredient.objects.create(user=self.user, name='Cookies')
-        recipe.ingredients.add(ing)
-
-        payload = {'ingredients': []}
-        url = detail_url(recipe.id)
-        res = self.client.patch(url, payload, format='json')
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(recipe.ingredients.count(), 0)
+            self.assertIn((ing['name'], self.user.id), ing_keys)
+
+    # ----- Tags and Ingredients --------------------
+
+    def test_create_related_on_update(self):
+        """ Test creating tags/ingredients when updating a recipe """
+        for field, model in RELATED_FIELDS:
+            with self.subTest(field=field):
+                recipe = create_recipe(user=self.user)
+
+                payload = {field: [{'name': 'Lunch'}]}
+                url = detail_url(recipe.id)
+                res = self.client.patch(url, payload, format='json')
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                new_obj = model.objects.get(user=self.user, name='Lunch')
+                related = getattr(recipe, field)
+                obj_ids = set(related.values_list('id', flat=True))
+                self.assertIn(new_obj.id, obj_ids)
+
+    def test_update_recipe_assign_related(self):
+        """Test updating a recipe's tags/ingredients"""
+        for field, model in RELATED_FIELDS:
+            with self.subTest(field=field):
+                recipe = create_recipe(user=self.user)
+                related = getattr(recipe, field)
+                original = model.objects.create(
+                    user=self.user, name='Cookies')
+                related.add(original)
+
+                updated = model.objects.create(user=self.user, name='Lunch')
+                payload = {field: [{'name': 'Lunch'}]}
+                url = detail_url(recipe.id)
+                res = self.client.patch(url, payload, format='json')
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                obj_ids = set(related.values_list('id', flat=True))
+                self.assertIn(updated.id, obj_ids)
+                self.assertNotIn(original.id, obj_ids)
+
+    def test_clear_recipe_related(self):
+        """ Test clearing a recipes tags/ingredients. """
+        for field, model in RELATED_FIELDS:
+            with self.subTest(field=field):
+                recipe = create_recipe(user=self.user)
+                related = getattr(recipe, field)
+                related.add(
+                    model.objects.create(user=self.user, name='Cookies'))
+
+                payload = {field: []}
+                url = detail_url(recipe.id)
+                res = self.client.patch(url, payload, format='json')
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(related.all()), 0)
 
     def test_filter_by_tags(self):
         """ Test filtering recipes by tags """
@@ -405,13 +491,12 @@ class PrivateRecipeAPITest(TestCase):
         tag2 = Tag.objects.create(user=self.user, name='Diet Foods')
         tag3 = Tag.objects.create(user=self.user, name='Drinks')
 
-        r1.tags.add(tag1)
-        r1.tags.add(tag2)
-        r2.tags.add(tag2)
-        r2.tags.add(tag3)
+        r1.tags.add(tag1, tag2)
+        r2.tags.add(tag2, tag3)
 
         params = {'tags': f'{tag1.id},{tag3.id}'}
-        res = self.client.get(RECIPES_URL, params)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL, params)
 
         s1 = RecipeSerializer(r1)
         s2 = RecipeSerializer(r2)
@@ -430,13 +515,12 @@ class PrivateRecipeAPITest(TestCase):
         ing2 = Ingredient.objects.create(user=self.user, name='Water')
         ing3 = Ingredient.objects.create(user=self.user, name='Salt')
 
-        r1.ingredients.add(ing1)
-        r1.ingredients.add(ing2)
-        r2.ingredients.add(ing2)
-        r2.ingredients.add(ing3)
+        r1.ingredients.add(ing1, ing2)
+        r2.ingredients.add(ing2, ing3)
 
         params = {'ingredients': f'{ing1.id},{ing3.id}'}
-        res = self.client.get(RECIPES_URL, params)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL, params)
 
         s1 = RecipeSerializer(r1)
         s2 = RecipeSerializer(r2)
@@ -446,6 +530,191 @@ class PrivateRecipeAPITest(TestCase):
         self.assertIn(s2.data, res.data)
         self.assertNotIn(s3.data, res.data)
 
+    def test_filter_ignores_invalid_ids(self):
+        """ Test invalid ids in filters are ignored instead of erroring """
+        tag = Tag.objects.create(user=self.user, name='Eats')
+        r1 = create_recipe(user=self.user, title='Fasting Foods')
+        r1.tags.add(tag)
+        create_recipe(user=self.user, title='Chocolate cake')
+
+        for tags in (f'{tag.id},abc', f'{tag.id},\u00b2'):
+            with self.subTest(tags=tags):
+                res = self.client.get(RECIPES_URL, {'tags': tags})
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual([r['id'] for r in res.data], [r1.id])
+
+        res = self.client.get(RECIPES_URL, {'ingredients': 'abc'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+
+    def test_filter_ids_with_spaces(self):
+        """ Test ids separated by comma and space are all used """
+        r1 = create_recipe(user=self.user, title='Fasting Foods')
+        r2 = create_recipe(user=self.user, title='Fasting Drinks')
+        create_recipe(user=self.user, title='Chocolate cake')
+        tag1 = Tag.objects.create(user=self.user, name='Eats')
+        tag2 = Tag.objects.create(user=self.user, name='Drinks')
+        r1.tags.add(tag1)
+        r2.tags.add(tag2)
+
+        res = self.client.get(RECIPES_URL, {'tags': f'{tag1.id}, {tag2.id}'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual({r['id'] for r in res.data}, {r1.id, r2.id})
+
+
+class RecipeSerializerTests(TestCase):
+    """Tests for rendering recipes with the recipe serializers."""
+
+    def test_shared_tag_rendered_as_copies(self):
+        """ Test a tag on two recipes renders as two separate dicts """
+        user = create_user(email='user@example.com', password='test123')
+        tag = Tag.objects.create(user=user, name='Vegan')
+        for title in ('Salad', 'Soup'):
+            create_recipe(user=user, title=title).tags.add(tag)
+
+        data = RecipeSerializer(
+            Recipe.objects.order_by('id'), many=True).data
+        first, second = (recipe['tags'][0] for recipe in data)
+
+        self.assertEqual(first, second)
+        first['name'] = 'Changed'
+        self.assertEqual(second['name'], 'Vegan')
+
+    def test_validated_data_rendered(self):
+        """ Test .data works on a validated serializer without instance """
+        serializer = RecipeSerializer(data={
+            'title': 'Salad',
+            'time_minutes': 5,
+            'price': '2.30',
+            'tags': [{'name': 'Vegan'}],
+            'ingredients': [{'name': 'Lettuce'}],
+        })
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.data['tags'], [{'name': 'Vegan'}])
+        self.assertEqual(
+            serializer.data['ingredients'], [{'name': 'Lettuce'}])
+
+
+class RecipeListCacheTests(TestCase):
+    """Tests for cached recipe list responses."""
+
+    @classmethod
+    def setUpClass(cls):
+        """ Cache in a temporary directory shared like a real server"""
+        cache_dir = tempfile.mkdtemp(prefix='tst_cache_')
+        cls.addClassCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        cache_settings = override_settings(CACHES={
+            'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': cache_dir,
+            }
+        })
+        cache_settings.enable()
+        cls.addClassCleanup(cache_settings.disable)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email='user@example.com', password='test123')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_cached_list_skips_database(self):
+        """ Test a repeated list request is served without queries """
+        create_recipe(user=self.user)
+        self.client.get(RECIPES_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+
+    def test_new_recipe_invalidates_list(self):
+        """ Test creating a recipe invalidates the cached list """
+        create_recipe(user=self.user)
+        self.client.get(RECIPES_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_recipe(user=self.user, title='Another recipe')
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(len(res.data), 2)
+
+    def test_renamed_tag_invalidates_list(self):
+        """ Test renaming a tag refreshes recipes nesting it """
+        recipe = create_recipe(user=self.user)
+        tag = Tag.objects.create(user=self.user, name='Lunch')
+        recipe.tags.add(tag)
+        self.client.get(RECIPES_URL)
+
+        url = reverse('recipe:tag-detail', args=[tag.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {'name': 'Dinner'})
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data[0]['tags'][0]['name'], 'Dinner')
+
+    def test_deleted_recipe_invalidates_lists(self):
+        """ Test deleting a recipe refreshes recipe and assigned lists """
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(Tag.objects.create(user=self.user, name='Lunch'))
+        assigned = {'assigned_only': 1}
+        self.assertEqual(len(self.client.get(RECIPES_URL).data), 1)
+        self.assertEqual(len(self.client.get(TAGS_URL, assigned).data), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(detail_url(recipe.id))
+
+        self.assertEqual(self.client.get(RECIPES_URL).data, [])
+        self.assertEqual(self.client.get(TAGS_URL, assigned).data, [])
+
+    def test_reassigned_tags_invalidate_lists(self):
+        """ Test changing a recipe's tags refreshes the cached lists """
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(Tag.objects.create(user=self.user, name='Lunch'))
+        Tag.objects.create(user=self.user, name='Dinner')
+        assigned = {'assigned_only': 1}
+        self.client.get(RECIPES_URL)
+        self.client.get(TAGS_URL, assigned)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                detail_url(recipe.id),
+                {'tags': [{'name': 'Dinner'}]},
+                format='json',
+            )
+
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(
+            [tag['name'] for tag in res.data[0]['tags']], ['Dinner'])
+        res = self.client.get(TAGS_URL, assigned)
+        self.assertEqual([tag['name'] for tag in res.data], ['Dinner'])
+
+    def test_local_memory_cache_not_used(self):
+        """ Test lists aren't cached in a per-process cache """
+        create_recipe(user=self.user)
+        local_cache = override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            }
+        })
+        with local_cache:
+            self.client.get(RECIPES_URL)
+
+            with self.assertNumQueries(3):
+                res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(len(res.data), 1)
+
 # ----- Image Tests API: --------------------------------
 
 
@@ -454,28 +723,40 @@ class ImageUploadTests(TestCase):
     Test the image upload endpoint
     """
 
-    def setUp(self):
-        """ Set up for image tests"""
-        self.client = APIClient()
-        self.user = create_user(
+    @classmethod
+    def setUpClass(cls):
+        """ Store uploads in a temporary media root removed afterwards"""
+        media_root = tempfile.mkdtemp(prefix='tst_media_')
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        cls.addClassCleanup(media_settings.disable)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        """ Create user and recipe once for image tests"""
+        cls.user = create_user(
             email='user@example.com',
             password='testpass1234'
         )
-        self.client.force_authenticate(self.user)
-        self.recipe = create_recipe(user=self.user)
+        cls.recipe = create_recipe(user=cls.user)
+        image_buffer = io.BytesIO()
+        Image.new('RGB', (10, 10)).save(image_buffer, format='JPEG')
+        cls.jpeg_bytes = image_buffer.getvalue()
 
-    def tearDown(self):
-        self.recipe.image.delete()
+    def setUp(self):
+        """ Set up for image tests"""
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
 
     def test_upload_image(self):
         """ Test uploading an image"""
         url = img_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
-            img = Image.new('RGB', (10, 10))
-            img.save(image_file, format='JPEG')
-            image_file.seek(0)
-            payload = {'image': image_file}
-            res = self.client.post(url, payload, format='multipart')
+        image_file = SimpleUploadedFile(
+            'image.jpg', self.jpeg_bytes, content_type='image/jpeg')
+        payload = {'image': image_file}
+        res = self.client.post(url, payload, format='multipart')
 
         self.recipe.refresh_from_db()
         self.assertEqual(res.status_code, status.HTTP_200_OK)
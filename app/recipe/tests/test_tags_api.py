@@ -2,10 +2,11 @@
 Test Tags API.
 """
 from decimal import Decimal
+from functools import lru_cache
 
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -17,9 +18,12 @@ from core.models import (
 
 from recipe.serializers import TagSerializer
 
+User = get_user_model()
+
 TAGS_URL = reverse('recipe:tag-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(tag_id):
     return reverse('recipe:tag-detail', args=[tag_id])
 
@@ -28,7 +32,7 @@ def detail_url(tag_id):
 
 def create_user_helper(email='user@example.com', password='testpassword123'):
     """Helper function to create a user."""
-    return get_user_model().objects.create_user(email=email, password=password)
+    return User.objects.create_user(email=email, password=password)
 
 
 def create_recipe_helper(user, title='testing title', time=10, price='4.50'):
@@ -42,7 +46,7 @@ def create_recipe_helper(user, title='testing title', time=10, price='4.50'):
 
 
 # Test classes:
-class PublicTagsApiTests(TestCase):
+class PublicTagsApiTests(SimpleTestCase):
     """Tests for the public tags API."""
 
     def setUp(self):
@@ -67,10 +71,13 @@ class PrivateTagsApiTests(TestCase):
     def test_retrieve_tags(self):
         """ Test for retrieving list of tags """
 
-        Tag.objects.create(user=self.user, name='Vegan')
-        Tag.objects.create(user=self.user, name='Desert')
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name='Vegan'),
+            Tag(user=self.user, name='Desert'),
+        ])
 
-        res = self.client.get(TAGS_URL)
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL)
 
         tags = Tag.objects.all().order_by('-name')
         serializer = TagSerializer(tags, many=True)
@@ -2,6 +2,9 @@
 
 Views for recipe APIs.
 """
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
 from drf_spectacular.utils import (
     extend_schema_view,
     extend_schema,
@@ -28,6 +31,26 @@ from core.models import (
 )
 
 from recipe import serializers
+from recipe.cache import (
+    LIST_CACHE_TIMEOUT,
+    list_cache_enabled,
+    list_cache_key,
+)
+
+
+class CachedListMixin:
+    """Serve list responses from cache until the user's data changes."""
+
+    def list(self, request, *args, **kwargs):
+        """ Return the cached list, rendering it on a miss. """
+        if not list_cache_enabled():
+            return super().list(request, *args, **kwargs)
+        key = list_cache_key(self.queryset.model._meta.model_name, request)
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, LIST_CACHE_TIMEOUT)
+        return Response(data)
 
 
 @extend_schema_view(
@@ -44,32 +67,48 @@ from recipe import serializers
         ]
     )
 )
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(CachedListMixin, viewsets.ModelViewSet):
     """View for manage recipe APIs."""
     queryset = Recipe.objects.all()
     serializer_class = serializers.RecipeDetailSerializer
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def _params_to_int(self, qs):
-        """ Convert a list of strings to integers. """
-        return [int(str_id) for str_id in qs.split(',')]
+    @staticmethod
+    def _params_to_int(qs):
+        """ Convert a comma separated string to integers, skipping junk. """
+        str_ids = (str_id.strip() for str_id in qs.split(','))
+        # isdigit() also accepts characters like '²' that int() rejects.
+        return tuple(int(str_id) for str_id in str_ids
+                     if str_id.isdecimal())
 
     def get_queryset(self):
         """Retrieve recipes for authenticated user."""
         tags = self.request.query_params.get('tags')
         ingredients = self.request.query_params.get('ingredients')
-        queryset = self.queryset
-        if tags:
-            tag_ids = self._params_to_int(tags)
+        queryset = self.queryset.filter(user=self.request.user)
+        joined = False
+        tag_ids = self._params_to_int(tags) if tags else ()
+        if tag_ids:
             queryset = queryset.filter(tags__id__in=tag_ids)
-        if ingredients:
-            ingredient_ids = self._params_to_int(ingredients)
+            joined = True
+        ingredient_ids = (
+            self._params_to_int(ingredients) if ingredients else ()
+        )
+        if ingredient_ids:
             queryset = queryset.filter(ingredients__id__in=ingredient_ids)
+            joined = True
 
-        return queryset.filter(
-            user=self.request.user
-        ).order_by('-id').distinct()
+        queryset = queryset.order_by('-id')
+        if joined:
+            queryset = queryset.distinct()
+
+        if self.action in ('list', 'retrieve'):
+            # Only these actions render prefetched tags and ingredients.
+            queryset = serializers.RecipeSerializer.setup_eager_loading(
+                queryset
+            )
+        return queryset
 
         # self.queryset.filter(user=self.request.user).order_by('-id')
 
@@ -110,7 +149,8 @@ class RecipeViewSet(viewsets.ModelViewSet):
         ]
     )
 )
-class BaseAttributeViewSet(mixins.DestroyModelMixin,
+class BaseAttributeViewSet(CachedListMixin,
+                           mixins.DestroyModelMixin,
                            mixins.UpdateModelMixin,
                            mixins.ListModelMixin,
                            viewsets.GenericViewSet):
@@ -118,6 +158,8 @@ class BaseAttributeViewSet(mixins.DestroyModelMixin,
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    assigned_rel_name = None
+
     def get_queryset(self):
         """Filter queryset to authenticated user. """
         assigned_only = bool(
@@ -125,19 +167,27 @@ class BaseAttributeViewSet(mixins.DestroyModelMixin,
         )
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
+            assigned = Recipe.objects.filter(
+                **{self.assigned_rel_name: OuterRef('pk')}
+            )
+            queryset = queryset.filter(Exists(assigned))
+        if self.action == 'list':
+            # Only load what the serializers render.
+            queryset = queryset.only('id', 'name')
         return queryset.filter(
             user=self.request.user
-        ).order_by('-name').distinct()
+        ).order_by('-name')
 
 
 class TagViewSet(BaseAttributeViewSet):
     """View for manage recipe tags APIs."""
     queryset = Tag.objects.all()
     serializer_class = serializers.TagSerializer
+    assigned_rel_name = 'tags'
 
 
 class IngredientViewSet(BaseAttributeViewSet):
     """View for manage recipe ingredients APIs."""
     queryset = Ingredient.objects.all()
     serializer_class = serializers.IngredientSerializer
+    assigned_rel_name = 'ingredients'
@@ -1,7 +1,7 @@
 """
 Tests for the user api
 """
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -9,6 +9,8 @@ from rest_framework.test import APIClient
 from rest_framework import status
 
 
+User = get_user_model()
+
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
 ME_URL = reverse('user:me')
@@ -16,21 +18,21 @@ ME_URL = reverse('user:me')
 
 def create_user(**params):
     """Create and return a new user"""
-    return get_user_model().objects.create_user(**params)
+    return User.objects.create_user(**params)
+
 
+_DEFAULT_PAYLOAD = {
+    'email': 'test@example.com',
+    'password': 'testpass1234',
+    'name': 'Testing_Name_Person',
+}
 
-def payload_helper(
-        email='test@example.com',
-        password='testpass1234',
-        name='Testing_Name_Person'):
+
+def payload_helper(**overrides):
     """Payload helper so I don't have to copy-pasta
         every time it's needed.
     """
-    return {
-        'email': email,
-        'password': password,
-        'name': name,
-    }
+    return {**_DEFAULT_PAYLOAD, **overrides}
 
 
 class PublicUserApiTests(TestCase):
@@ -45,7 +47,7 @@ class PublicUserApiTests(TestCase):
         res = self.client.post(CREATE_USER_URL, payload)
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        user = get_user_model().objects.get(email=payload['email'])
+        user = User.objects.get(email=payload['email'])
         self.assertTrue(user.check_password(payload['password']))
         self.assertNotIn('password', res.data)
 
@@ -59,11 +61,11 @@ class PublicUserApiTests(TestCase):
 
     def test_password_to_short(self):
         """Test if password is to short"""
-        payload = payload_helper('pw')
+        payload = payload_helper(password='pw')
         res = self.client.post(CREATE_USER_URL, payload)
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
-        user_exists = get_user_model().objects.filter(
+        user_exists = User.objects.filter(
             email=payload['email']
         ).exists()
         self.assertFalse(user_exists)
@@ -103,6 +105,13 @@ class PublicUserApiTests(TestCase):
         self.assertNotIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+
+class PublicUserAuthTests(SimpleTestCase):
+    """Test the public user api features that don't use the database"""
+
+    def setUp(self):
+        self.client = APIClient()
+
     def test_retrieve_user_unauthorized(self):
         """ Test authentication is required for users. """
         res = self.client.get(ME_URL)